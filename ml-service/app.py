@@ -2,15 +2,20 @@
 Flask API for Price Prediction Service
 """
 import os
+import math
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 from dotenv import load_dotenv
 import sys
+from itertools import product
+import numpy as np
+import pandas as pd
 
 # Add utils to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'utils'))
 
 from utils.train_model import FarePredictionModel
+from utils.responses import CachedResponse, fast_jsonify
 
 load_dotenv()
 
@@ -27,14 +32,34 @@ except Exception as e:
     print("Please run 'python utils/data_collector.py' and 'python utils/train_model.py' first")
     model = None
 
-@app.route('/health', methods=['GET'])
-def health_check():
-    """Health check endpoint"""
-    return jsonify({
+def is_number(value):
+    """True for finite JSON numbers (bool is an int in Python, so excluded)"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+# Responses that only change when a model is loaded
+cached_responses = {}
+
+def render_cached_responses():
+    """Pre-render /health and /model-info bodies for the current model"""
+    cached_responses.clear()
+    cached_responses['health'] = CachedResponse({
         'status': 'healthy',
         'model_loaded': model is not None,
         'service': 'ml-price-prediction'
     })
+    if model is not None:
+        cached_responses['model_info'] = CachedResponse({
+            'model_loaded': True,
+            'metadata': model.model_metadata,
+            'features': model.feature_columns
+        })
+
+render_cached_responses()
+
+@app.route('/health', methods=['GET'])
+def health_check():
+    """Health check endpoint"""
+    return cached_responses['health'].make_response()
 
 @app.route('/predict', methods=['POST'])
 def predict_fare():
@@ -85,7 +110,7 @@ def predict_fare():
             service_provider=data['service_provider']
         )
         
-        return jsonify({
+        return fast_jsonify({
             'predicted_fare': round(predicted_fare, 2),
             'distance_km': data['distance_km'],
             'transport_type': data['transport_type'],
@@ -119,10 +144,15 @@ def get_best_time():
         # Validate
         if 'distance_km' not in data:
             return jsonify({'error': 'Missing distance_km'}), 400
+        if not is_number(data['distance_km']):
+            return jsonify({'error': 'distance_km must be a number'}), 400
         
         transport_type = data.get('transport_type', 'cab')
         service_provider = data.get('service_provider', 'obeer')
         hours_ahead = data.get('hours_ahead', 24)
+        if not is_number(hours_ahead) or hours_ahead != int(hours_ahead):
+            return jsonify({'error': 'hours_ahead must be a whole number'}), 400
+        hours_ahead = int(hours_ahead)
         
         # Get recommendation
         recommendation = model.predict_best_time(
@@ -135,7 +165,7 @@ def get_best_time():
         if recommendation is None:
             return jsonify({'error': 'Could not generate recommendation'}), 500
         
-        return jsonify(recommendation)
+        return fast_jsonify(recommendation)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -162,6 +192,10 @@ def batch_predict():
         if not distance_km:
             return jsonify({'error': 'Missing distance_km'}), 400
         
+        for field in ['distance_km', 'duration_mins', 'hour', 'day_of_week']:
+            if field in data and not is_number(data[field]):
+                return jsonify({'error': f'{field} must be a number'}), 400
+        
         transport_types = data.get('transport_types', ['bike', 'auto', 'cab'])
         service_providers = data.get('service_providers', ['obeer', 'radipoo', 'yela'])
         
@@ -171,30 +205,30 @@ def batch_predict():
         day_of_week = data.get('day_of_week', now.weekday())
         duration_mins = data.get('duration_mins', distance_km * 3)
         
-        predictions = []
+        # Score every transport/provider combination in one model call
+        combos = pd.DataFrame(
+            list(product(transport_types, service_providers)),
+            columns=['transport_type', 'service_provider']
+        )
+        combos['distance_km'] = distance_km
+        combos['duration_mins'] = duration_mins
+        combos['hour'] = hour
+        combos['day_of_week'] = day_of_week
         
-        for transport in transport_types:
-            for provider in service_providers:
-                try:
-                    fare = model.predict_fare(
-                        distance_km=distance_km,
-                        duration_mins=duration_mins,
-                        hour=hour,
-                        day_of_week=day_of_week,
-                        transport_type=transport,
-                        service_provider=provider
-                    )
-                    
-                    predictions.append({
-                        'transport_type': transport,
-                        'service_provider': provider,
-                        'predicted_fare': round(fare, 2)
-                    })
-                except Exception as e:
-                    print(f"Error predicting {transport}/{provider}: {e}")
-                    continue
-        
-        return jsonify({
+        fares = np.round(model.predict_fares(combos), 2)
+        
+        predictions = []
+        for transport, provider, fare in zip(combos['transport_type'], combos['service_provider'], fares.tolist()):
+            if np.isnan(fare):
+                print(f"Error predicting {transport}/{provider}: unknown transport type or provider, or invalid hour/day")
+                continue
+            predictions.append({
+                'transport_type': transport,
+                'service_provider': provider,
+                'predicted_fare': fare
+            })
+        
+        return fast_jsonify({
             'distance_km': distance_km,
             'predictions': predictions
         })
@@ -208,14 +242,7 @@ def model_info():
     if model is None:
         return jsonify({'error': 'Model not loaded'}), 503
     
-    try:
-        return jsonify({
-            'model_loaded': True,
-            'metadata': model.model_metadata,
-            'features': model.feature_columns
-        })
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    return cached_responses['model_info'].make_response()
 
 if __name__ == '__main__':
     port = int(os.getenv('FLASK_PORT', 5001))
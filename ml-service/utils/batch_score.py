@@ -0,0 +1,212 @@
+"""
+Batch Scorer - Stream large trip logs through the fare model in parallel
+
+Usage:
+    python utils/batch_score.py trips.csv predictions.csv --workers 8
+
+Input and output can be CSV or Parquet (Parquet needs pyarrow installed).
+"""
+import os
+import sys
+import time
+import argparse
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from train_model import FarePredictionModel
+
+# Model used by _score_chunk: inherited from the parent under fork,
+# loaded by _init_worker under spawn
+_worker_model = None
+
+def _load_model(model_dir):
+    model = FarePredictionModel()
+    model.load_model(model_dir)
+    # Parallelism comes from the process pool, not from the forest
+    model.model.n_jobs = 1
+    return model
+
+def _init_worker(model_dir):
+    """Load the model in a spawned worker process"""
+    global _worker_model
+    _worker_model = _load_model(model_dir)
+
+def _use_fork():
+    """Whether workers can be forked from a parent that already holds the model
+
+    Forked workers share the parent's tree arrays copy-on-write. Windows has
+    no fork and it is unsafe on macOS, so those load one copy per worker.
+    """
+    return sys.platform != 'darwin' and 'fork' in multiprocessing.get_all_start_methods()
+
+def _score_chunk(chunk, schema, header):
+    """Score one chunk in a worker process and encode it for the output file
+
+    Returns CSV text, or an Arrow table with the given schema for Parquet
+    output, so the parent only has to append results in order.
+    """
+    chunk['predicted_fare'] = _worker_model.predict_fares(chunk).round(2)
+    if schema is not None:
+        pa = _import_pyarrow()
+        return pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+    return chunk.to_csv(index=False, header=header)
+
+def _is_parquet(path):
+    return path.lower().endswith(('.parquet', '.pq'))
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet files need pyarrow: pip install pyarrow")
+    return pyarrow
+
+def iter_chunks(input_path, chunk_size):
+    """Yield the input file as DataFrames of at most chunk_size rows"""
+    if _is_parquet(input_path):
+        pa = _import_pyarrow()
+        parquet_file = pa.parquet.ParquetFile(input_path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        # Read as text so columns keep one type across chunks and are written
+        # back unchanged; predict_fares parses the numbers it needs
+        yield from pd.read_csv(input_path, chunksize=chunk_size, dtype=str)
+
+def output_schema(input_path):
+    """Arrow schema for Parquet output: input columns plus predicted_fare"""
+    pa = _import_pyarrow()
+    if _is_parquet(input_path):
+        schema = pa.parquet.ParquetFile(input_path).schema_arrow.remove_metadata()
+    else:
+        columns = pd.read_csv(input_path, nrows=0).columns
+        schema = pa.schema([(col, pa.string()) for col in columns])
+    # Re-scoring a previous output replaces its predictions
+    if 'predicted_fare' in schema.names:
+        schema = schema.remove(schema.get_field_index('predicted_fare'))
+    return schema.append(pa.field('predicted_fare', pa.float64()))
+
+class ChunkWriter:
+    """Append encoded chunks to a CSV or Parquet file (schema=None for CSV)"""
+
+    def __init__(self, output_path, schema=None):
+        if schema is not None:
+            pa = _import_pyarrow()
+            self._writer = pa.parquet.ParquetWriter(output_path, schema)
+            self._file = None
+        else:
+            self._writer = None
+            self._file = open(output_path, 'w', newline='', encoding='utf-8')
+
+    def write(self, encoded):
+        if self._writer is not None:
+            self._writer.write_table(encoded)
+        else:
+            self._file.write(encoded)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+
+def score_file(input_path, output_path, model_dir='models', workers=None,
+               chunk_size=100000, report_every=10):
+    """Score every row of input_path and write it with a predicted_fare column
+
+    Chunks are scored and encoded in order by a pool of worker processes.
+    At most 2 * workers chunks are in flight, so memory stays bounded
+    regardless of input size.
+    """
+    global _worker_model
+
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 2
+
+    if _use_fork():
+        # Load once here, forked workers inherit it
+        _worker_model = _load_model(model_dir)
+        pool_args = {'mp_context': multiprocessing.get_context('fork')}
+    else:
+        pool_args = {
+            'mp_context': multiprocessing.get_context('spawn'),
+            'initializer': _init_worker,
+            'initargs': (model_dir,)
+        }
+
+    schema = output_schema(input_path) if _is_parquet(output_path) else None
+    writer = ChunkWriter(output_path, schema)
+    pending = deque()
+    total_rows = 0
+    chunks_done = 0
+    start = time.perf_counter()
+
+    def drain_one():
+        nonlocal total_rows, chunks_done
+        rows, future = pending.popleft()
+        writer.write(future.result())
+        total_rows += rows
+        chunks_done += 1
+        if chunks_done % report_every == 0:
+            elapsed = time.perf_counter() - start
+            print(f"Scored {total_rows} rows ({total_rows / elapsed:,.0f} rows/sec)")
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, **pool_args) as executor:
+            for i, chunk in enumerate(iter_chunks(input_path, chunk_size)):
+                future = executor.submit(_score_chunk, chunk, schema, i == 0)
+                pending.append((len(chunk), future))
+                if len(pending) >= max_in_flight:
+                    drain_one()
+            while pending:
+                drain_one()
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    rows_per_sec = total_rows / elapsed if elapsed > 0 else 0.0
+    print(f"Scored {total_rows} rows in {elapsed:.1f}s "
+          f"({rows_per_sec:,.0f} rows/sec, {workers} workers)")
+    print(f"Predictions saved to {output_path}")
+
+    return {
+        'rows': total_rows,
+        'seconds': elapsed,
+        'rows_per_sec': rows_per_sec,
+        'workers': workers
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk fare scoring for trip logs")
+    parser.add_argument('input', help="Input trips file (.csv or .parquet)")
+    parser.add_argument('output', help="Output predictions file (.csv or .parquet)")
+    parser.add_argument('--model-dir', default='models', help="Directory with the trained model")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument('--chunk-size', type=int, default=100000, help="Rows per chunk")
+    return parser.parse_args(argv)
+
+if __name__ == '__main__':
+    args = parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"Input file not found: {args.input}")
+        exit(1)
+
+    model_path = os.path.join(args.model_dir, 'fare_prediction_model.pkl')
+    if not os.path.exists(model_path):
+        print(f"Model not found at {model_path}")
+        print("Please run 'python utils/data_collector.py' and 'python utils/train_model.py' first")
+        exit(1)
+
+    score_file(
+        args.input,
+        args.output,
+        model_dir=args.model_dir,
+        workers=args.workers,
+        chunk_size=args.chunk_size
+    )
@@ -0,0 +1,177 @@
+"""
+Response Benchmark - Compare the old and new /batch-predict and /best-time paths
+
+Usage:
+    python utils/benchmark_responses.py --model-dir models
+
+Payloads match what the routes return: /batch-predict is every
+transport/provider combination (3 x 3 = 9 by default, --rows to change)
+and /best-time is 12 predictions, the most predict_best_time returns.
+
+Two measurements per route, in response bytes/sec:
+- encode: jsonify with per-element round() vs vectorized round + orjson
+- score + encode: one predict_fare call per row vs one predict_fares call,
+  which needs a trained model in --model-dir (skipped otherwise)
+"""
+import os
+import sys
+import time
+import argparse
+from itertools import product
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from flask import Flask, jsonify
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from responses import dumps_json
+from train_model import FarePredictionModel
+
+TRANSPORT_TYPES = ['bike', 'auto', 'cab']
+SERVICE_PROVIDERS = ['obeer', 'radipoo', 'yela']
+RUSH_HOURS = [7, 8, 9, 17, 18, 19]
+
+def batch_predict_before(combos, fares):
+    """Old /batch-predict encoding: per-element round() and jsonify"""
+    predictions = []
+    for (transport, provider), fare in zip(combos, fares):
+        predictions.append({
+            'transport_type': transport,
+            'service_provider': provider,
+            'predicted_fare': round(float(fare), 2)
+        })
+    return jsonify({'distance_km': 10, 'predictions': predictions}).get_data()
+
+def batch_predict_after(combos, fares):
+    """New /batch-predict encoding: vectorized round and dumps_json"""
+    fares = np.round(fares, 2)
+    predictions = [
+        {'transport_type': transport, 'service_provider': provider, 'predicted_fare': fare}
+        for (transport, provider), fare in zip(combos, fares.tolist())
+    ]
+    return dumps_json({'distance_km': 10, 'predictions': predictions})
+
+def best_time_before(times, fares):
+    """Old /best-time encoding: per-element round() and jsonify"""
+    all_predictions = [
+        {
+            'hour': t.hour,
+            'datetime': t.isoformat(),
+            'fare': round(float(fare), 2),
+            'is_rush_hour': t.hour in RUSH_HOURS
+        }
+        for t, fare in zip(times, fares)
+    ]
+    return jsonify({'best_fare': round(float(min(fares)), 2), 'all_predictions': all_predictions}).get_data()
+
+def best_time_after(times, fares):
+    """New /best-time encoding: vectorized round and dumps_json"""
+    hours = np.array([t.hour for t in times])
+    is_rush_hour = np.isin(hours, RUSH_HOURS)
+    fares = np.round(fares, 2)
+    all_predictions = [
+        {'hour': hour, 'datetime': t.isoformat(), 'fare': fare, 'is_rush_hour': rush}
+        for hour, t, fare, rush in zip(hours.tolist(), times, fares.tolist(), is_rush_hour.tolist())
+    ]
+    return dumps_json({'best_fare': fares.min(), 'all_predictions': all_predictions})
+
+def score_batch_before(model, combos):
+    """Old /batch-predict scoring: one predict_fare call per combination"""
+    fares = [
+        model.predict_fare(10, 30, 18, 2, transport, provider)
+        for transport, provider in combos
+    ]
+    return batch_predict_before(combos, fares)
+
+def score_batch_after(model, combos):
+    """New /batch-predict scoring: one predict_fares call"""
+    df = pd.DataFrame(combos, columns=['transport_type', 'service_provider'])
+    df['distance_km'] = 10
+    df['duration_mins'] = 30
+    df['hour'] = 18
+    df['day_of_week'] = 2
+    return batch_predict_after(combos, model.predict_fares(df))
+
+def score_best_time_before(model, times):
+    """Old predict_best_time: one predict_fare call per hour (24 hours)"""
+    fares = []
+    for t in times:
+        duration = 45 * (1.5 if t.hour in RUSH_HOURS else 1)
+        fares.append(round(model.predict_fare(15, duration, t.hour, t.weekday(), 'cab', 'obeer'), 2))
+    best = int(np.argmin(fares))
+    return jsonify({
+        'current_fare': fares[0],
+        'best_time': times[best].isoformat(),
+        'best_fare': fares[best],
+        'savings': round(max(0, fares[0] - fares[best]), 2),
+        'wait_hours': best,
+        'all_predictions': [
+            {'hour': t.hour, 'datetime': t.isoformat(), 'fare': fare, 'is_rush_hour': t.hour in RUSH_HOURS}
+            for t, fare in zip(times[:12], fares[:12])
+        ]
+    }).get_data()
+
+def score_best_time_after(model, times):
+    """New predict_best_time: one predict_fares call for all hours"""
+    recommendation = model.predict_best_time(15, 'cab', 'obeer', len(times))
+    return dumps_json(recommendation)
+
+def measure(fn, *args, repeat=20):
+    """Return (bytes per response, bytes/sec) for the best of repeat runs"""
+    best = float('inf')
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = len(fn(*args))
+        best = min(best, time.perf_counter() - start)
+    return size, size / best
+
+def report(name, before, after, args, repeat):
+    size_before, rate_before = measure(before, *args, repeat=repeat)
+    size_after, rate_after = measure(after, *args, repeat=repeat)
+    print(f"{name}:")
+    print(f"  before: {size_before} bytes, {rate_before / 1e3:,.0f} KB/s "
+          f"({size_before / rate_before * 1e3:.3f} ms/response)")
+    print(f"  after:  {size_after} bytes, {rate_after / 1e3:,.0f} KB/s "
+          f"({size_after / rate_after * 1e3:.3f} ms/response, {rate_after / rate_before:.1f}x)")
+
+def load_benchmark_model(model_dir):
+    if not os.path.exists(os.path.join(model_dir, 'fare_prediction_model.pkl')):
+        return None
+    model = FarePredictionModel()
+    model.load_model(model_dir)
+    return model
+
+def run(rows=9, repeat=2000, model_dir='models'):
+    combos = list(product(TRANSPORT_TYPES, SERVICE_PROVIDERS))
+    combos = (combos * (rows // len(combos) + 1))[:rows]
+    fares = np.random.default_rng(42).uniform(30, 500, max(rows, 12))
+    now = datetime.now()
+    times = [now + timedelta(hours=i) for i in range(24)]
+
+    print(f"/batch-predict rows: {rows}, /best-time rows: 12")
+    app = Flask(__name__)
+    with app.app_context():
+        report("/batch-predict encode", batch_predict_before, batch_predict_after,
+               (combos, fares[:rows]), repeat)
+        report("/best-time encode", best_time_before, best_time_after,
+               (times[:12], fares[:12]), repeat)
+
+        model = load_benchmark_model(model_dir)
+        if model is None:
+            print(f"No model in {model_dir}, skipping score + encode")
+            return
+        # Scoring is far slower than encoding, so fewer runs are enough
+        report("/batch-predict score + encode", score_batch_before, score_batch_after,
+               (model, combos), max(1, repeat // 100))
+        report("/best-time score + encode", score_best_time_before, score_best_time_after,
+               (model, times), max(1, repeat // 100))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark /batch-predict and /best-time responses")
+    parser.add_argument('--rows', type=int, default=9, help="Predictions per /batch-predict response")
+    parser.add_argument('--repeat', type=int, default=2000, help="Runs per encode measurement")
+    parser.add_argument('--model-dir', default='models', help="Directory with the trained model")
+    args = parser.parse_args()
+    run(rows=args.rows, repeat=args.repeat, model_dir=args.model_dir)
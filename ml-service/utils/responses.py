@@ -0,0 +1,27 @@
+"""
+Response Helpers - Fast JSON encoding and pre-rendered responses
+"""
+import hashlib
+import orjson
+from flask import Response, request
+
+def dumps_json(payload):
+    """Serialize payload to JSON bytes, NumPy arrays and scalars included"""
+    return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+
+def fast_jsonify(payload, status=200):
+    """Drop-in for jsonify on hot routes"""
+    return Response(dumps_json(payload), status=status, mimetype='application/json')
+
+class CachedResponse:
+    """JSON body rendered once, served with an ETag"""
+
+    def __init__(self, payload):
+        self.body = dumps_json(payload)
+        self.etag = hashlib.sha1(self.body).hexdigest()
+
+    def make_response(self):
+        """Build the response for the current request (304 on If-None-Match hit)"""
+        response = Response(self.body, mimetype='application/json')
+        response.set_etag(self.etag)
+        return response.make_conditional(request)
@@ -162,62 +162,135 @@ class FarePredictionModel:
         
         prediction = self.model.predict(X_scaled)[0]
         return max(0, prediction)  # Ensure non-negative
-    
+
+    def predict_fares(self, df):
+        """Predict fares for a DataFrame of trips (vectorized predict_fare)
+
+        Expects distance_km, transport_type, service_provider and either
+        hour/day_of_week or timestamp columns. duration_mins is optional.
+        Rows with unknown transport types or providers, a distance that is not
+        a finite number, or an hour/day that is not a whole number in 0-23/0-6
+        get NaN.
+        """
+        if self.model is None:
+            raise ValueError("Model not trained. Call train() first.")
+
+        distance = pd.to_numeric(df['distance_km'], errors='coerce').astype(float)
+
+        # Estimate duration if not provided (3 mins per km)
+        if 'duration_mins' in df.columns:
+            duration = pd.to_numeric(df['duration_mins'], errors='coerce').astype(float).fillna(distance * 3)
+        else:
+            duration = distance * 3
+
+        # Time features from explicit columns or from timestamp
+        if 'hour' in df.columns and 'day_of_week' in df.columns:
+            hour = pd.to_numeric(df['hour'], errors='coerce').astype(float)
+            day_of_week = pd.to_numeric(df['day_of_week'], errors='coerce').astype(float)
+        elif 'timestamp' in df.columns:
+            timestamps = pd.to_datetime(df['timestamp'], errors='coerce')
+            hour = timestamps.dt.hour.astype(float)
+            day_of_week = timestamps.dt.dayofweek.astype(float)
+        else:
+            raise ValueError("Need 'hour' and 'day_of_week' or 'timestamp' columns")
+
+        # Hour must be a whole number 0-23 and day a whole number 0-6
+        # (NaN fails every comparison, so missing values are invalid too)
+        hours = hour.to_numpy()
+        days = day_of_week.to_numpy()
+        valid_numbers = (
+            np.isfinite(distance.to_numpy())
+            & (hours >= 0) & (hours <= 23) & (hours == np.floor(hours))
+            & (days >= 0) & (days <= 6) & (days == np.floor(days))
+        )
+        hour = hour.where(valid_numbers, 0).astype(int)
+        day_of_week = day_of_week.where(valid_numbers, 0).astype(int)
+
+        # Same average speed rule as predict_fare
+        avg_speed = (distance / (duration.where(duration > 0) / 60)).fillna(20)
+
+        # Encode categorical variables, unknown labels become -1
+        transport_encoded = pd.Categorical(
+            df['transport_type'], categories=self.label_encoders['transport_type'].classes_
+        ).codes
+        service_encoded = pd.Categorical(
+            df['service_provider'], categories=self.label_encoders['service_provider'].classes_
+        ).codes
+
+        features = pd.DataFrame({
+            'distance_km': distance,
+            'duration_mins': duration,
+            'hour': hour,
+            'day_of_week': day_of_week,
+            'is_weekend': day_of_week.isin([5, 6]).astype(int),
+            'is_rush_hour': hour.isin([7, 8, 9, 17, 18, 19]).astype(int),
+            'avg_speed': avg_speed,
+            'transport_type_encoded': transport_encoded,
+            'service_provider_encoded': service_encoded
+        }, index=df.index)
+
+        valid = valid_numbers & (transport_encoded >= 0) & (service_encoded >= 0)
+        fares = np.full(len(df), np.nan)
+        if valid.any():
+            X_scaled = self.scaler.transform(features.loc[valid, self.feature_columns])
+            fares[valid] = np.maximum(0, self.model.predict(X_scaled))  # Ensure non-negative
+        return fares
+
     def predict_best_time(self, distance_km, transport_type='cab', 
                          service_provider='obeer', hours_ahead=24):
         """Predict best time to book in next N hours"""
-        predictions = []
         current_time = datetime.now()
+        times = [current_time + pd.Timedelta(hours=hour_offset) for hour_offset in range(hours_ahead)]
+        if not times:
+            return None
+        
+        hours = np.array([t.hour for t in times])
+        is_rush_hour = np.isin(hours, [7, 8, 9, 17, 18, 19])
         
-        for hour_offset in range(hours_ahead):
-            future_time = current_time + pd.Timedelta(hours=hour_offset)
-            hour = future_time.hour
-            day_of_week = future_time.weekday()  # Fixed: use weekday() instead of dayofweek
-            
-            # Estimate duration (simple heuristic)
-            base_duration = distance_km * 3  # 3 mins per km
-            if hour in [7, 8, 9, 17, 18, 19]:  # Rush hour
-                duration = base_duration * 1.5
-            else:
-                duration = base_duration
-            
-            try:
-                fare = self.predict_fare(
-                    distance_km=distance_km,
-                    duration_mins=duration,
-                    hour=hour,
-                    day_of_week=day_of_week,
-                    transport_type=transport_type,
-                    service_provider=service_provider
-                )
-                
-                predictions.append({
-                    'hour': hour,
-                    'datetime': future_time.isoformat(),
-                    'fare': round(fare, 2),
-                    'is_rush_hour': hour in [7, 8, 9, 17, 18, 19]
-                })
-            except Exception as e:
-                print(f"Error predicting for hour {hour}: {e}")
-                continue
-        
-        if not predictions:
+        # Estimate duration (simple heuristic): 3 mins per km, 1.5x in rush hour
+        base_duration = distance_km * 3
+        trips = pd.DataFrame({
+            'distance_km': distance_km,
+            'duration_mins': np.where(is_rush_hour, base_duration * 1.5, base_duration),
+            'hour': hours,
+            'day_of_week': [t.weekday() for t in times],
+            'transport_type': transport_type,
+            'service_provider': service_provider
+        })
+        
+        # Score all hours in one model call
+        fares = np.round(self.predict_fares(trips), 2)
+        if np.isnan(fares).any():
+            print(f"Error predicting best time: unknown {transport_type}/{service_provider}")
             return None
         
         # Find best time (lowest fare)
-        predictions_df = pd.DataFrame(predictions)
-        best_time = predictions_df.loc[predictions_df['fare'].idxmin()]
-        current_fare = predictions[0]['fare'] if predictions else None
-        
-        savings = current_fare - best_time['fare'] if current_fare else 0
+        best_idx = int(np.argmin(fares))
+        best_fare = float(fares[best_idx])
+        current_fare = float(fares[0])
+        
+        savings = current_fare - best_fare if current_fare else 0
+        
+        # Return next 12 hours
+        all_predictions = [
+            {
+                'hour': hour,
+                'datetime': t.isoformat(),
+                'fare': fare,
+                'is_rush_hour': rush
+            }
+            for hour, t, fare, rush in zip(
+                hours[:12].tolist(), times[:12], fares[:12].tolist(), is_rush_hour[:12].tolist()
+            )
+        ]
         
         return {
             'current_fare': round(current_fare, 2) if current_fare else None,
-            'best_time': best_time['datetime'],
-            'best_fare': round(best_time['fare'], 2),
+            'best_time': times[best_idx].isoformat(),
+            'best_fare': round(best_fare, 2),
             'savings': round(max(0, savings), 2),
-            'wait_hours': predictions_df.loc[predictions_df['fare'].idxmin()].name,
-            'all_predictions': predictions[:12]  # Return next 12 hours
+            'wait_hours': best_idx,
+            'all_predictions': all_predictions
         }
     
     def save_model(self, model_dir='models'):